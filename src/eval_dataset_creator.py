@@ -18,11 +18,14 @@ Features
         - truth_table
         - fill_in_the_blanks
     * Auto-generated JSON templates for structured types.
-- Saves annotations to a JSON file as a list of entries.
+- Appends annotations to a JSON Lines sidecar (one entry per line) from a
+  background writer, which also refreshes the dataset JSON file (a list of
+  entries) periodically; "Export" writes it on demand.
 
 Dependencies
 ------------
-pip install gradio pymupdf pillow
+pip install gradio pymupdf
+pip install orjson  # optional, faster dataset reads/writes
 
 Run
 ---
@@ -32,35 +35,313 @@ python pdf_qa_annotator.py
 import os
 import json
 import time
-from typing import Dict, List, Any, Tuple, Optional
+import atexit
+import calendar
+import functools
+import hashlib
+import mmap
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple, Optional, Union
 
 import gradio as gr
 import fitz  # PyMuPDF
-from PIL import Image
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # ----------------------------
 # Utility functions
 # ----------------------------
 
-def list_pdfs_in_directory(pdf_dir: str) -> Dict[str, str]:
-    """Return a mapping {pdf_name: full_path} for all PDFs in directory."""
-    pdf_paths: Dict[str, str] = {}
+def list_pdfs_in_directory(pdf_dir: str) -> Optional[List[str]]:
+    """Return the sorted file names of all PDFs in directory, or None if it cannot be read."""
+    pdf_names: List[str] = []
+
+    # Filter before sorting; DirEntry.is_file() usually needs no extra stat call.
+    # A missing path or a file is reported by scandir itself, saving an isdir() stat.
+    try:
+        with os.scandir(pdf_dir) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    # Hidden files, e.g. macOS "._manual.pdf" resource forks
+                    continue
+                if entry.name.lower().endswith(".pdf") and entry.is_file():
+                    pdf_names.append(entry.name)
+    except OSError:
+        # FileNotFoundError, NotADirectoryError, PermissionError, ...
+        return None
+
+    pdf_names.sort()
+    return pdf_names
+
+
+def resolve_pdf_path(pdf_dir: str, pdf_name: str) -> Optional[str]:
+    """Return the full path of a PDF in the scanned directory, or None if it does not exist."""
+    if not pdf_dir or not pdf_name:
+        return None
+
+    pdf_path = os.path.join(pdf_dir, pdf_name)
+    if not os.path.isfile(pdf_path):
+        return None
+    return pdf_path
+
+
+# PyMuPDF is not thread-safe: every access to a document or page, including
+# the background prefetches below, goes through this lock.
+_RENDER_LOCK = threading.Lock()
+
+# Renders neighbouring pages in the background while the annotator reads the
+# current one. A single worker is enough since renders are serialized anyway.
+_render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-prefetch")
+
+# Seconds a prefetch waits before rendering. If another page is requested in
+# the meantime the slider is still moving, and the prefetch is dropped.
+PREFETCH_SETTLE_SECONDS = 0.3
+
+# Incremented on every page request; a prefetch only runs while its generation
+# is still the latest. At most one prefetch is queued at any time.
+_prefetch_lock = threading.Lock()
+_prefetch_generation = 0
+_prefetch_future: Optional[Future] = None
+
+# MuPDF keeps decoded images and fonts in a global store that is shared by all
+# documents. Once it grows past this many bytes it is trimmed after a render.
+MUPDF_STORE_LIMIT = 128 << 20
+
+# JPEG quality of the rendered page previews.
+PREVIEW_JPEG_QUALITY = 80
+
+# Number of rendered pages kept in memory; the preview file of an evicted page
+# is deleted, so each run keeps at most this many previews on disk.
+MAX_RENDERED_PAGES = 64
+
+# Rendered pages keyed by (pdf_path, mtime, page_number, zoom) and ordered from
+# least to most recently used, mapped to (preview_path, text).
+_RENDERED_PAGES: "OrderedDict[Tuple[str, float, int, float], Tuple[str, str]]" = OrderedDict()
+
+# Preview directories of runs that were killed are removed once they have not
+# been touched for this many seconds. Each holds the PID of the run using it.
+STALE_PREVIEW_DIR_SECONDS = 24 * 3600
+_PREVIEW_DIR_PREFIX = "pdf_qa_pages_"
+_PREVIEW_DIR_PID_FILE = "owner.pid"
+
+
+def _preview_dir_in_use(path: str) -> bool:
+    """Return True if the process that created a preview directory is still running."""
+    try:
+        with open(os.path.join(path, _PREVIEW_DIR_PID_FILE)) as f:
+            pid = int(f.read())
+    except (OSError, ValueError):
+        return False
+    if os.name != "posix":
+        # os.kill cannot probe a process here without terminating it
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists, but belongs to another user
+        return True
+    return True
+
+
+def _remove_stale_preview_dirs() -> None:
+    """Remove preview directories left behind by earlier runs that did not exit cleanly."""
+    cutoff = time.time() - STALE_PREVIEW_DIR_SECONDS
+    try:
+        with os.scandir(tempfile.gettempdir()) as it:
+            for entry in it:
+                if (entry.name.startswith(_PREVIEW_DIR_PREFIX) and entry.is_dir()
+                        and entry.stat().st_mtime < cutoff and not _preview_dir_in_use(entry.path)):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+    except OSError:
+        pass
+
+
+# Rendered page previews are written here and served to Gradio by path.
+_remove_stale_preview_dirs()
+_PREVIEW_DIR = tempfile.mkdtemp(prefix=_PREVIEW_DIR_PREFIX)
+with open(os.path.join(_PREVIEW_DIR, _PREVIEW_DIR_PID_FILE), "w") as _pid_file:
+    _pid_file.write(str(os.getpid()))
+
+# Number of PDFs kept open between page renders.
+MAX_OPEN_DOCUMENTS = 4
+
+# Documents opened through _open_document, keyed by (pdf_path, mtime) and
+# ordered from least to most recently used, with the memory map backing them.
+_OPEN_DOCUMENTS: "OrderedDict[Tuple[str, float], Tuple[fitz.Document, memoryview, mmap.mmap]]" = OrderedDict()
+
+
+def _close_document(doc: fitz.Document, buf: memoryview, mm: mmap.mmap) -> None:
+    """Close a document opened by _open_document and unmap its file."""
+    doc.close()
+    buf.release()
+    try:
+        mm.close()
+    except BufferError:
+        # PyMuPDF still exports the buffer; the mapping is released with it
+        pass
+
+
+def _open_document(pdf_path: str, mtime: float) -> fitz.Document:
+    """
+    Open a PDF once and reuse it across page renders. Must be called with _RENDER_LOCK held.
+
+    The file is memory-mapped read-only and handed to MuPDF as a stream, so
+    object data is paged in on demand instead of being read through file I/O.
+    The file's mtime is part of the cache key so that a PDF modified on disk
+    is re-opened instead of served from a stale document; the mapping of the
+    old version is closed right away. Documents beyond MAX_OPEN_DOCUMENTS are
+    closed as they are evicted, which also releases the file lock Windows
+    holds on mapped files.
+
+    Note that a PDF truncated on disk while it is mapped makes any access to
+    the lost part of the mapping raise SIGBUS on POSIX systems, which kills the
+    process. PDFs should be replaced (written to a new file and renamed), not
+    rewritten in place, while the annotation tool has them open.
+    """
+    key = (pdf_path, mtime)
+    cached = _OPEN_DOCUMENTS.get(key)
+    if cached is not None:
+        _OPEN_DOCUMENTS.move_to_end(key)
+        return cached[0]
+
+    # Other versions of this file are stale; do not keep their mappings around
+    for stale_key in [k for k in _OPEN_DOCUMENTS if k[0] == pdf_path]:
+        _close_document(*_OPEN_DOCUMENTS.pop(stale_key))
+
+    fd = os.open(pdf_path, os.O_RDONLY)
+    try:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        # The mapping keeps its own reference to the file.
+        os.close(fd)
+
+    # Page navigation jumps around the file, so readahead is mostly wasted.
+    if hasattr(mmap, "MADV_RANDOM"):
+        mm.madvise(mmap.MADV_RANDOM)
+
+    buf = memoryview(mm)
+    try:
+        doc = fitz.open(stream=buf, filetype="pdf")
+    except Exception:
+        buf.release()
+        mm.close()
+        raise
+
+    _OPEN_DOCUMENTS[key] = (doc, buf, mm)
+    while len(_OPEN_DOCUMENTS) > MAX_OPEN_DOCUMENTS:
+        _, evicted = _OPEN_DOCUMENTS.popitem(last=False)
+        _close_document(*evicted)
+    return doc
 
-    if not pdf_dir or not os.path.isdir(pdf_dir):
-        return pdf_paths
 
-    for fname in sorted(os.listdir(pdf_dir)):
-        if fname.lower().endswith(".pdf"):
-            full = os.path.join(pdf_dir, fname)
-            pdf_paths[fname] = full
+def _preview_path(pdf_path: str, mtime: float, page_number: int, zoom: float) -> str:
+    """Return the preview file for a rendered page; the same page always maps to the same file."""
+    key = f"{pdf_path}\0{mtime!r}\0{page_number}\0{zoom!r}"
+    return os.path.join(_PREVIEW_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jpg")
 
-    return pdf_paths
 
+def _render_page(pdf_path: str, mtime: float, page_number: int, zoom: float) -> Tuple[str, str]:
+    """
+    Render a (1-based) page to a JPEG file and extract its text. Must be called with _RENDER_LOCK held.
 
-def render_pdf_page(pdf_path: str, page_number: int) -> Tuple[Optional[Image.Image], str, int, str]:
+    The JPEG is encoded by MuPDF directly from the pixmap and written to the
+    preview directory; the returned path can be served by Gradio as is.
+    Results are memoized for the MAX_RENDERED_PAGES most recently used pages.
     """
-    Render a single PDF page to an image and extract text.
+    key = (pdf_path, mtime, page_number, zoom)
+    cached = _RENDERED_PAGES.get(key)
+    if cached is not None and os.path.exists(cached[0]):
+        _RENDERED_PAGES.move_to_end(key)
+        return cached
+
+    doc = _open_document(pdf_path, mtime)
+    page = doc[page_number - 1]
+
+    mat = fitz.Matrix(zoom, zoom)
+    # JPEG has no alpha channel
+    pix = page.get_pixmap(matrix=mat, alpha=False)
+
+    # MuPDF encodes the pixmap's own sample buffer straight into the file, so
+    # neither the pixels nor the encoded JPEG are copied into Python objects.
+    # Write next to the target and rename, so a preview Gradio is still
+    # copying is never seen half-written.
+    image_path = _preview_path(pdf_path, mtime, page_number, zoom)
+    tmp_path = image_path + ".tmp"
+    # Recreate the directory if something cleaned up the temp dir under us
+    os.makedirs(_PREVIEW_DIR, exist_ok=True)
+    pix.save(tmp_path, output="jpg", jpg_quality=PREVIEW_JPEG_QUALITY)
+    os.replace(tmp_path, image_path)
+
+    # TEXTFLAGS_TEXT preserves whitespace and clips to the page's mediabox
+    text = page.get_text("text", flags=fitz.TEXTFLAGS_TEXT) or ""
+
+    # Drop our references so MuPDF can release the page's resources
+    page = None
+    pix = None
+    if fitz.TOOLS.store_size > MUPDF_STORE_LIMIT:
+        fitz.TOOLS.store_shrink(50)
+
+    _RENDERED_PAGES[key] = (image_path, text)
+    while len(_RENDERED_PAGES) > MAX_RENDERED_PAGES:
+        _, (evicted_path, _) = _RENDERED_PAGES.popitem(last=False)
+        try:
+            os.remove(evicted_path)
+        except OSError:
+            # Already gone, or still open elsewhere on Windows
+            pass
+
+    return image_path, text
+
+
+@functools.lru_cache(maxsize=64)
+def _page_blocks_text(pdf_path: str, mtime: float, page_number: int) -> str:
+    """Return a (1-based) page's text blocks, each prefixed with its number and bounding box."""
+    doc = _open_document(pdf_path, mtime)
+    page = doc[page_number - 1]
+
+    parts: List[str] = []
+    for x0, y0, x1, y1, block_text, block_no, block_type in page.get_text("blocks"):
+        if block_type != 0:
+            # Image block
+            continue
+        parts.append(f"[{block_no}] ({x0:.0f}, {y0:.0f}, {x1:.0f}, {y1:.0f})\n{block_text.strip()}")
+    return "\n\n".join(parts)
+
+
+@atexit.register
+def _close_open_documents() -> None:
+    """Drop the render caches, close any PDF still held open and remove the previews."""
+    _render_pool.shutdown(wait=True, cancel_futures=True)
+    with _RENDER_LOCK:
+        _RENDERED_PAGES.clear()
+        _page_blocks_text.cache_clear()
+        while _OPEN_DOCUMENTS:
+            _, entry = _OPEN_DOCUMENTS.popitem()
+            _close_document(*entry)
+    shutil.rmtree(_PREVIEW_DIR, ignore_errors=True)
+
+
+def render_pdf_page(pdf_path: str,
+                    page_number: int,
+                    zoom: float = 1.5,
+                    show_blocks: bool = False) -> Tuple[Optional[str], str, int, str]:
+    """
+    Render a single PDF page to a JPEG image file and extract text.
+
+    The opened document and the rendered pages are cached, so moving back and
+    forth through the same PDF does not re-parse or re-render it.
 
     Parameters
     ----------
@@ -68,61 +349,169 @@ def render_pdf_page(pdf_path: str, page_number: int) -> Tuple[Optional[Image.Ima
         Full path to the PDF file.
     page_number : int
         1-based page number.
+    zoom : float
+        Render scale relative to the PDF's native resolution.
+    show_blocks : bool
+        Return the page text as numbered blocks with their bounding boxes
+        instead of plain text.
 
     Returns
     -------
-    (image, text, total_pages, info_message)
+    (image_path, text, total_pages, info_message)
     """
     if not os.path.exists(pdf_path):
         return None, "", 0, f"PDF file not found: {pdf_path}"
 
-    try:
-        doc = fitz.open(pdf_path)
-    except Exception as e:
-        return None, "", 0, f"Error opening PDF: {e}"
+    with _RENDER_LOCK:
+        try:
+            mtime = os.path.getmtime(pdf_path)
+            doc = _open_document(pdf_path, mtime)
+        except Exception as e:
+            return None, "", 0, f"Error opening PDF: {e}"
 
-    total_pages = len(doc)
-    if total_pages == 0:
-        doc.close()
-        return None, "", 0, "PDF has no pages."
+        total_pages = len(doc)
+        if total_pages == 0:
+            return None, "", 0, "PDF has no pages."
 
-    # Clamp page_number
-    if page_number < 1:
-        page_number = 1
-    if page_number > total_pages:
-        page_number = total_pages
+        # Clamp page_number
+        if page_number < 1:
+            page_number = 1
+        if page_number > total_pages:
+            page_number = total_pages
 
-    try:
-        page = doc[page_number - 1]
-        # Render the page as an image (increase zoom for readability)
-        zoom = 2.0
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat)
+        try:
+            image_path, text = _render_page(pdf_path, mtime, page_number, zoom)
+            if show_blocks:
+                text = _page_blocks_text(pdf_path, mtime, page_number)
+            info = f"Loaded page {page_number} / {total_pages} from '{os.path.basename(pdf_path)}'."
+            return image_path, text, total_pages, info
+        except Exception as e:
+            return None, "", 0, f"Error rendering page: {e}"
+
+
+def cancel_prefetch() -> int:
+    """Invalidate any pending or running prefetch. Returns the new prefetch generation."""
+    global _prefetch_generation, _prefetch_future
+
+    with _prefetch_lock:
+        _prefetch_generation += 1
+        if _prefetch_future is not None:
+            _prefetch_future.cancel()
+            _prefetch_future = None
+        return _prefetch_generation
+
+
+def _prefetch_pages(generation: int, pdf_path: str, pages: List[int]) -> None:
+    """Render pages into the render cache once the slider has settled on the page they surround."""
+    time.sleep(PREFETCH_SETTLE_SECONDS)
+    for page_number in pages:
+        if generation != _prefetch_generation:
+            # A newer page was requested; these neighbours are no longer wanted
+            return
+        render_pdf_page(pdf_path, page_number)
+
+
+def prefetch_neighbor_pages(pdf_path: str, page_number: int, total_pages: int) -> None:
+    """
+    Render the pages before and after page_number in the background, filling the render cache.
 
-        mode = "RGB"
-        if pix.n >= 4:
-            mode = "RGBA"
+    The prefetch replaces any earlier one and only starts after
+    PREFETCH_SETTLE_SECONDS without another page request.
+    """
+    global _prefetch_future
 
-        image = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
+    pages = [p for p in (page_number + 1, page_number - 1) if 1 <= p <= total_pages]
+    generation = cancel_prefetch()
+    if not pages:
+        return
 
-        text = page.get_text("text") or ""
-        info = f"Loaded page {page_number} / {total_pages} from '{os.path.basename(pdf_path)}'."
+    with _prefetch_lock:
+        if generation == _prefetch_generation:
+            _prefetch_future = _render_pool.submit(_prefetch_pages, generation, pdf_path, pages)
 
-        doc.close()
-        return image, text, total_pages, info
-    except Exception as e:
-        doc.close()
-        return None, "", 0, f"Error rendering page: {e}"
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def jsonl_path_for(json_path: str) -> str:
+    """
+    Return the path of the JSON Lines sidecar that backs a dataset JSON file.
+
+    "dataset.json" is backed by "dataset.jsonl". Any other name gets ".jsonl"
+    appended, so the sidecar never is the output file itself (e.g. "x.jsonl"
+    is backed by "x.jsonl.jsonl").
+    """
+    base, ext = os.path.splitext(json_path)
+    if ext.lower() == ".json":
+        return base + ".jsonl"
+    return json_path + ".jsonl"
+
+
+# mtime of each dataset JSON file right after this process last wrote it. A
+# different mtime means the file was changed outside the tool, e.g. by hand.
+_own_json_mtimes: Dict[str, float] = {}
+_own_json_mtimes_lock = threading.Lock()
+
+
+def _entry_time(entry: Dict[str, Any]) -> float:
+    """Return an entry's creation time as a Unix timestamp, or 0 if it has none."""
+    try:
+        return calendar.timegm(time.strptime(entry.get("timestamp", ""), "%Y-%m-%dT%H:%M:%SZ"))
+    except (TypeError, ValueError):
+        return 0.0
 
 
 def load_existing_dataset(json_path: str) -> List[Dict[str, Any]]:
-    """Load existing dataset JSON (list of dicts). Return [] if file doesn't exist or is invalid."""
-    if not json_path or not os.path.exists(json_path):
+    """
+    Load existing dataset entries (list of dicts). Return [] if nothing exists or is invalid.
+
+    The JSON Lines sidecar is preferred, since it also holds entries that were
+    not exported to the JSON file yet. Use open_dataset to first pick up
+    changes made to the JSON file itself.
+    """
+    if not json_path:
+        return []
+
+    jsonl_path = jsonl_path_for(json_path)
+    if os.path.exists(jsonl_path):
+        entries: List[Dict[str, Any]] = []
+        try:
+            with open(jsonl_path, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = _json_loads(line)
+                    except Exception:
+                        # Skip a truncated or hand-edited line
+                        continue
+                    if isinstance(entry, dict):
+                        entries.append(entry)
+        except Exception:
+            return []
+        return entries
+
+    if not os.path.exists(json_path):
         return []
 
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(json_path, "rb") as f:
+            data = _json_loads(f.read())
         if isinstance(data, list):
             return data
         else:
@@ -132,11 +521,296 @@ def load_existing_dataset(json_path: str) -> List[Dict[str, Any]]:
         return []
 
 
+def append_to_dataset(json_path: str, entries: List[Dict[str, Any]]) -> None:
+    """Append entries to the dataset's JSON Lines sidecar, one JSON object per line."""
+    jsonl_path = jsonl_path_for(json_path)
+    os.makedirs(os.path.dirname(jsonl_path) or ".", exist_ok=True)
+    # Serialize first and write once, so a failing entry leaves no partial batch behind
+    data = b"".join(_json_dumps(entry) + b"\n" for entry in entries)
+    with open(jsonl_path, "ab") as f:
+        f.write(data)
+
+
 def save_dataset(json_path: str, entries: List[Dict[str, Any]]) -> None:
     """Save list of entries to JSON file."""
     os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+    with open(json_path, "wb") as f:
+        f.write(_json_dumps(entries, indent=True))
+    with _own_json_mtimes_lock:
+        _own_json_mtimes[json_path] = os.path.getmtime(json_path)
+
+
+def sync_sidecar_with_json(json_path: str) -> bool:
+    """
+    Rebuild the JSON Lines sidecar if the dataset JSON changed after it, e.g. by hand.
+
+    The JSON file is what people read and fix, so its entries win. Sidecar
+    entries created after the JSON was changed, and missing from it, are kept.
+    A JSON file without a sidecar is copied into a new one. Returns True if
+    the sidecar was (re)built.
+
+    Raises ValueError if the changed JSON cannot be read as a list of entries,
+    so that callers neither load a stale sidecar nor overwrite the JSON.
+    """
+    jsonl_path = jsonl_path_for(json_path)
+    try:
+        json_mtime = os.path.getmtime(json_path)
+    except OSError:
+        return False
+
+    with _own_json_mtimes_lock:
+        own_mtime = _own_json_mtimes.get(json_path)
+    if own_mtime == json_mtime:
+        # Last written (or synced) by this process
+        return False
+    try:
+        sidecar_mtime: Optional[float] = os.path.getmtime(jsonl_path)
+    except OSError:
+        sidecar_mtime = None
+    # Without a record of our own last write, a JSON file older than its
+    # sidecar is taken to be an earlier snapshot of it
+    if own_mtime is None and sidecar_mtime is not None and json_mtime <= sidecar_mtime:
+        return False
+
+    try:
+        with open(json_path, "rb") as f:
+            data = _json_loads(f.read())
+    except Exception as e:
+        raise ValueError(f"'{json_path}' was changed but is not valid JSON: {e}")
+    if not isinstance(data, list):
+        raise ValueError(f"'{json_path}' was changed but is not a list of entries")
+
+    entries = list(data)
+    if sidecar_mtime is not None:
+        known_ids = {entry.get("id") for entry in entries if isinstance(entry, dict)}
+        cutoff = int(json_mtime)
+        for entry in load_existing_dataset(json_path):
+            if entry.get("id") not in known_ids and _entry_time(entry) >= cutoff:
+                entries.append(entry)
+
+    # Write next to the sidecar and rename, so it is never seen half-written
+    os.makedirs(os.path.dirname(jsonl_path) or ".", exist_ok=True)
+    tmp_path = jsonl_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"".join(_json_dumps(entry) + b"\n" for entry in entries))
+    os.replace(tmp_path, jsonl_path)
+
+    with _own_json_mtimes_lock:
+        _own_json_mtimes[json_path] = json_mtime
+    return True
+
+
+def open_dataset(json_path: str) -> List[Dict[str, Any]]:
+    """
+    Load a dataset for annotation and make sure its JSON Lines sidecar is current.
+
+    A dataset that so far only exists as a JSON file, or whose JSON file was
+    changed after the sidecar, is copied into the sidecar first (see
+    sync_sidecar_with_json), so that later appends keep its entries and edits.
+    """
+    # Entries still queued for this file would otherwise be missing
+    flush_dataset_writes()
+
+    sync_sidecar_with_json(json_path)
+    return load_existing_dataset(json_path)
+
+
+# ----------------------------
+# Background dataset writer
+# ----------------------------
+
+# The dataset JSON file is rewritten after this many new entries, or once this
+# many seconds have passed since the last snapshot, whichever comes first.
+SNAPSHOT_EVERY_ENTRIES = 20
+SNAPSHOT_EVERY_SECONDS = 30.0
+
+# Seconds before entries that could not be written are tried again.
+RETRY_WRITE_SECONDS = 5.0
+
+# Queue item asking the writer to snapshot every dataset with unsaved entries.
+_SNAPSHOT_NOW = object()
+
+_write_queue: "queue.Queue[Any]" = queue.Queue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+# Per dataset JSON path: entries whose append to the sidecar failed and that
+# are retried on the writer's next pass, and the last write error. Guarded by
+# _write_status_lock, since the callbacks read them to report failures.
+_write_status_lock = threading.Lock()
+_unwritten_entries: Dict[str, List[Dict[str, Any]]] = {}
+_write_errors: Dict[str, str] = {}
+
+
+def _with_unwritten(json_path: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return entries plus those waiting to be retried for json_path, so JSON writes keep them."""
+    with _write_status_lock:
+        pending = list(_unwritten_entries.get(json_path, []))
+    if not pending:
+        return entries
+    known_ids = {entry.get("id") for entry in entries}
+    return entries + [entry for entry in pending if entry.get("id") not in known_ids]
+
+
+def _dataset_writer_loop() -> None:
+    """Drain the write queue: append entries to the JSONL sidecars and snapshot the JSON files."""
+    datasets: Dict[str, List[Dict[str, Any]]] = {}
+    unsaved: Dict[str, int] = {}
+    last_snapshot = time.monotonic()
+
+    while True:
+        with _write_status_lock:
+            retry_pending = bool(_unwritten_entries)
+        timeout = RETRY_WRITE_SECONDS if retry_pending else SNAPSHOT_EVERY_SECONDS
+        try:
+            items = [_write_queue.get(timeout=timeout)]
+        except queue.Empty:
+            items = []
+        # Coalesce everything queued meanwhile into one batch
+        while True:
+            try:
+                items.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Entries that failed before go first, to keep the sidecar in order
+        with _write_status_lock:
+            batches = dict(_unwritten_entries)
+            _unwritten_entries.clear()
+
+        snapshot_all = False
+        for item in items:
+            if item is _SNAPSHOT_NOW:
+                snapshot_all = True
+            else:
+                json_path, entry = item
+                batches.setdefault(json_path, []).append(entry)
+
+        try:
+            for json_path, batch in batches.items():
+                # Pick up edits made to the JSON file before appending after them
+                try:
+                    if sync_sidecar_with_json(json_path):
+                        datasets.pop(json_path, None)
+                except Exception as e:
+                    with _write_status_lock:
+                        _write_errors[json_path] = f"Not updating JSON: {e}"
+
+                try:
+                    append_to_dataset(json_path, batch)
+                except Exception as e:
+                    with _write_status_lock:
+                        _unwritten_entries[json_path] = batch
+                        _write_errors[json_path] = f"Error saving to JSONL: {e}"
+                    # The next snapshot still puts them in the JSON file
+                    unsaved[json_path] = unsaved.get(json_path) or 1
+                    continue
+
+                with _write_status_lock:
+                    _write_errors.pop(json_path, None)
+                if json_path in datasets:
+                    datasets[json_path].extend(batch)
+                else:
+                    # The sidecar now holds the full dataset, including this batch
+                    datasets[json_path] = load_existing_dataset(json_path)
+                unsaved[json_path] = unsaved.get(json_path, 0) + len(batch)
+
+            due = snapshot_all or time.monotonic() - last_snapshot >= SNAPSHOT_EVERY_SECONDS
+            for json_path, count in list(unsaved.items()):
+                if count and (due or count >= SNAPSHOT_EVERY_ENTRIES):
+                    try:
+                        # Never overwrite edits made to the JSON file since the last pass
+                        if sync_sidecar_with_json(json_path) or json_path not in datasets:
+                            datasets[json_path] = load_existing_dataset(json_path)
+                    except Exception as e:
+                        with _write_status_lock:
+                            _write_errors[json_path] = f"Not updating JSON: {e}"
+                        continue
+                    try:
+                        save_dataset(json_path, _with_unwritten(json_path, datasets[json_path]))
+                    except Exception as e:
+                        with _write_status_lock:
+                            _write_errors[json_path] = f"Error saving to JSON: {e}"
+                        continue
+                    unsaved[json_path] = 0
+                    with _write_status_lock:
+                        if json_path not in _unwritten_entries:
+                            _write_errors.pop(json_path, None)
+            if due:
+                last_snapshot = time.monotonic()
+        finally:
+            for _ in items:
+                _write_queue.task_done()
+
+
+def enqueue_dataset_entry(json_path: str, entry: Dict[str, Any]) -> None:
+    """Queue an entry to be appended to the dataset by the background writer."""
+    global _writer_thread
+
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_dataset_writer_loop, name="dataset-writer", daemon=True)
+            _writer_thread.start()
+    _write_queue.put((json_path, entry))
+
+
+def flush_dataset_writes() -> None:
+    """Block until every queued entry has been processed (written, or held back for a retry)."""
+    if _writer_thread is not None:
+        _write_queue.join()
+
+
+def dataset_write_warning(json_path: str, entries: List[Dict[str, Any]]) -> str:
+    """
+    Describe a failed background write to a dataset, or return "" if there is none.
+
+    entries are the session's own entries; the warning counts which of them
+    are still waiting to be written.
+    """
+    with _write_status_lock:
+        error = _write_errors.get(json_path)
+        unwritten_ids = {entry.get("id") for entry in _unwritten_entries.get(json_path, [])}
+    if error is None:
+        return ""
+
+    if not unwritten_ids:
+        return f"⚠️ Could not update `{json_path}`: {error}. Questions are kept in `{jsonl_path_for(json_path)}`."
+
+    count = sum(1 for entry in entries if entry.get("id") in unwritten_ids)
+    return (f"⚠️ {count} of your question(s) are not saved to `{jsonl_path_for(json_path)}` yet: {error}. "
+            f"Retrying every {RETRY_WRITE_SECONDS:g} s; **Export JSON** writes them to the JSON file "
+            f"it exports to as well.")
+
+
+@atexit.register
+def _snapshot_datasets_on_exit() -> None:
+    """Write queued entries and snapshot every dataset with unsaved entries."""
+    if _writer_thread is not None:
+        _write_queue.put(_SNAPSHOT_NOW)
+        _write_queue.join()
+
+    with _write_status_lock:
+        for json_path, batch in _unwritten_entries.items():
+            print(f"Could not save {len(batch)} question(s) to {jsonl_path_for(json_path)}: "
+                  f"{_write_errors.get(json_path)}", file=sys.stderr)
+
+
+@functools.lru_cache(maxsize=32)
+def parse_structured_metadata(structured_meta: str) -> Any:
+    """
+    Parse the structured metadata JSON entered by the annotator.
+
+    Text that is not valid JSON is kept as {"raw": text}; empty text gives None.
+    Results are memoized, so the returned object is shared and must not be mutated.
+    """
+    if not structured_meta:
+        return None
+
+    try:
+        return _json_loads(structured_meta)
+    except Exception:
+        # If parsing fails, just keep as raw string
+        return {"raw": structured_meta}
 
 
 def generate_entry_id(pdf_name: str, page: int, existing_len: int) -> str:
@@ -149,20 +823,17 @@ def generate_entry_id(pdf_name: str, page: int, existing_len: int) -> str:
 # Template generation
 # ----------------------------
 
-def structured_template_for_type(qtype: str) -> str:
-    """
-    Return a JSON string template for the given question type.
-    This is meant to be edited by the annotator if needed.
-    """
-    if qtype == "multiple_choice":
-        template = {
+# Structured metadata templates per question type, serialized once at import.
+_TEMPLATES: Dict[str, str] = {
+    qtype: json.dumps(template, indent=2, ensure_ascii=False)
+    for qtype, template in {
+        "multiple_choice": {
             "type": "multiple_choice",
             # HELM / Harness-like structure (simplified)
             "choices": ["A", "B", "C", "D"],
             "correct_index": 0
-        }
-    elif qtype == "truth_table":
-        template = {
+        },
+        "truth_table": {
             "type": "truth_table",
             "columns": ["A", "B", "OUT"],
             "rows": [
@@ -171,87 +842,135 @@ def structured_template_for_type(qtype: str) -> str:
                 {"A": 1, "B": 0, "OUT": 1},
                 {"A": 1, "B": 1, "OUT": 1}
             ]
-        }
-    elif qtype == "fill_in_the_blanks":
-        template = {
+        },
+        "fill_in_the_blanks": {
             "type": "fill_in_the_blanks",
             "template": "The ___ is connected to pin ___.",
             "answers": ["resistor", "PA5"]
-        }
-    else:
-        # free_form or unknown
-        template = {
+        },
+        "free_form": {
             "type": "free_form",
             "notes": "No additional structured metadata required."
-        }
+        },
+    }.items()
+}
 
-    return json.dumps(template, indent=2, ensure_ascii=False)
+
+def structured_template_for_type(qtype: str) -> str:
+    """
+    Return a JSON string template for the given question type.
+    This is meant to be edited by the annotator if needed.
+    """
+    # free_form or unknown
+    return _TEMPLATES.get(qtype, _TEMPLATES["free_form"])
 
 
 # ----------------------------
 # Gradio callback functions
 # ----------------------------
 
-def on_scan_pdfs(pdf_dir: str) -> Tuple[gr.Dropdown, str, str, Dict[str, str]]:
+def on_scan_pdfs(pdf_dir: str) -> Tuple[gr.Dropdown, str, str]:
     """
     Scan directory for PDFs and populate dropdown.
     """
     pdf_dir = pdf_dir.strip()
-    if not pdf_dir or not os.path.isdir(pdf_dir):
+    choices = list_pdfs_in_directory(pdf_dir)
+    if choices is None:
         return (
             gr.Dropdown(choices=[], value=None),
             f"❌ Directory not found: '{pdf_dir}'",
             pdf_dir,
-            {}
         )
 
-    pdf_map = list_pdfs_in_directory(pdf_dir)
-    if not pdf_map:
+    if not choices:
         return (
             gr.Dropdown(choices=[], value=None),
             f"⚠️ No PDFs found in: '{pdf_dir}'",
             pdf_dir,
-            {}
         )
 
-    choices = list(pdf_map.keys())
     info = f"✅ Found {len(choices)} PDF(s) in '{pdf_dir}'. Select one from the dropdown."
-    return gr.Dropdown(choices=choices, value=choices[0]), info, pdf_dir, pdf_map
+    return gr.Dropdown(choices=choices, value=choices[0]), info, pdf_dir
 
 
 def on_select_pdf(pdf_dir: str,
-                  pdf_map: Dict[str, str],
-                  pdf_name: str) -> Tuple[Optional[Image.Image], str, gr.Slider, str]:
+                  pdf_name: str,
+                  show_blocks: bool,
+                  current_pdf: str) -> Tuple[Any, ...]:
     """
-    When a PDF is selected (or reselected), load page 1 and update page slider.
+    When a PDF is selected, load page 1 and update page slider.
+
+    Gradio also fires the change event when the dropdown is refreshed with the
+    same value; if that PDF is already loaded, the outputs are left untouched.
     """
-    if not pdf_name or not pdf_map or pdf_name not in pdf_map:
-        return None, "", gr.Slider(minimum=1, maximum=1, value=1, step=1), "⚠️ No PDF selected."
+    pdf_path = resolve_pdf_path(pdf_dir, pdf_name)
+    if pdf_path is None:
+        return None, "", gr.Slider(minimum=1, maximum=1, value=1, step=1), "⚠️ No PDF selected.", ("", 0), ""
+
+    # Compare full paths, a rescan may point to another directory with equally named files
+    if pdf_path == current_pdf:
+        return gr.skip(), gr.skip(), gr.skip(), gr.skip(), gr.skip(), gr.skip()
 
-    pdf_path = pdf_map[pdf_name]
-    image, text, total_pages, info = render_pdf_page(pdf_path, page_number=1)
+    # Renders of the previous PDF's pages would only delay this one
+    cancel_prefetch()
+
+    image, text, total_pages, info = render_pdf_page(pdf_path, page_number=1, show_blocks=show_blocks)
 
     if total_pages <= 0:
+        # Not loaded, so selecting this PDF again must try again
         slider = gr.Slider(minimum=1, maximum=1, value=1, step=1)
-    else:
-        slider = gr.Slider(minimum=1, maximum=total_pages, value=1, step=1)
+        return image, text, slider, info, ("", 0), ""
 
-    return image, text, slider, info
+    slider = gr.Slider(minimum=1, maximum=total_pages, value=1, step=1)
+    prefetch_neighbor_pages(pdf_path, 1, total_pages)
+    return image, text, slider, info, (pdf_name, 1), pdf_path
 
 
 def on_change_page(pdf_dir: str,
-                   pdf_map: Dict[str, str],
                    pdf_name: str,
-                   page_number: int) -> Tuple[Optional[Image.Image], str, str]:
+                   page_number: int,
+                   last_rendered: Tuple[str, int],
+                   show_blocks: bool) -> Tuple[Any, ...]:
     """
     When the page slider changes, re-render the page.
+
+    The slider also fires when it is reset by a PDF selection; if the page
+    shown is already the requested one, the outputs are left untouched.
+    Once the slider has settled, the neighbouring pages are prefetched.
     """
-    if not pdf_name or not pdf_map or pdf_name not in pdf_map:
-        return None, "", "⚠️ No PDF selected."
+    pdf_path = resolve_pdf_path(pdf_dir, pdf_name)
+    if pdf_path is None:
+        return None, "", "⚠️ No PDF selected.", ("", 0)
+
+    page_number = int(page_number)
+    if tuple(last_rendered or ()) == (pdf_name, page_number):
+        return gr.skip(), gr.skip(), gr.skip(), gr.skip()
+
+    # Neighbours of the page the slider just left would only delay this one
+    cancel_prefetch()
+    image, text, total_pages, info = render_pdf_page(pdf_path, page_number=page_number, show_blocks=show_blocks)
+
+    if image is None or total_pages <= 0:
+        # Not rendered, so moving back to this page must try again
+        return image, text, info, gr.skip()
+
+    prefetch_neighbor_pages(pdf_path, page_number, total_pages)
+    return image, text, info, (pdf_name, page_number)
 
-    pdf_path = pdf_map[pdf_name]
-    image, text, total_pages, info = render_pdf_page(pdf_path, page_number=int(page_number))
-    return image, text, info
+
+def on_toggle_blocks(pdf_dir: str,
+                     pdf_name: str,
+                     page_number: int,
+                     show_blocks: bool) -> str:
+    """
+    When "Show text blocks" is toggled, switch the text view of the current page.
+    """
+    pdf_path = resolve_pdf_path(pdf_dir, pdf_name)
+    if pdf_path is None:
+        return ""
+
+    _, text, _, _ = render_pdf_page(pdf_path, page_number=int(page_number), show_blocks=show_blocks)
+    return text
 
 
 def on_change_qtype(qtype: str) -> str:
@@ -262,16 +981,21 @@ def on_change_qtype(qtype: str) -> str:
 
 
 def on_add_question(pdf_dir: str,
-                    pdf_map: Dict[str, str],
                     pdf_name: str,
                     page_number: int,
                     question: str,
                     answer: str,
                     qtype: str,
                     structured_meta: str,
-                    json_path: str) -> str:
+                    json_path: str,
+                    dataset_path: str,
+                    entries: List[Dict[str, Any]]) -> Tuple[str, str, List[Dict[str, Any]]]:
     """
-    Add a new question to the JSON dataset.
+    Add a new question to the dataset.
+
+    The entry is handed to the background writer, which appends it to the
+    JSON Lines sidecar; the entries loaded so far are kept in session state,
+    so the dataset is only read from disk when the output file changes.
     """
     pdf_dir = (pdf_dir or "").strip()
     json_path = (json_path or "").strip()
@@ -279,32 +1003,29 @@ def on_add_question(pdf_dir: str,
     if not json_path:
         json_path = "dataset.json"
 
-    if not pdf_name or not pdf_map or pdf_name not in pdf_map:
-        return "❌ Cannot add question: no valid PDF selected."
+    pdf_path = resolve_pdf_path(pdf_dir, pdf_name)
+    if pdf_path is None:
+        return "❌ Cannot add question: no valid PDF selected.", dataset_path, entries
 
     if not question.strip():
-        return "❌ Question is empty."
+        return "❌ Question is empty.", dataset_path, entries
 
     if not answer.strip():
-        return "❌ Answer is empty."
+        return "❌ Answer is empty.", dataset_path, entries
 
-    pdf_path = pdf_map[pdf_name]
     page_number = int(page_number)
     if page_number < 1:
         page_number = 1
 
-    # Load existing entries
-    entries = load_existing_dataset(json_path)
-
-    # Parse structured metadata if possible
-    structured_obj: Any = None
-    structured_meta = (structured_meta or "").strip()
-    if structured_meta:
+    # Load existing entries once per output file
+    if dataset_path != json_path:
         try:
-            structured_obj = json.loads(structured_meta)
-        except Exception:
-            # If parsing fails, just keep as raw string
-            structured_obj = {"raw": structured_meta}
+            entries = open_dataset(json_path)
+        except Exception as e:
+            return f"❌ Error opening dataset: {e}", dataset_path, entries
+        dataset_path = json_path
+
+    structured_obj = parse_structured_metadata((structured_meta or "").strip())
 
     entry_id = generate_entry_id(pdf_name, page_number, len(entries))
 
@@ -320,16 +1041,62 @@ def on_add_question(pdf_dir: str,
         "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
     }
 
+    enqueue_dataset_entry(json_path, entry)
     entries.append(entry)
+
+    status = (f"✅ Added question #{len(entries)}.\n\n"
+              f"- ID: `{entry_id}`\n"
+              f"- PDF: `{pdf_name}` page {page_number}\n"
+              f"- Saving to: `{jsonl_path_for(json_path)}`")
+
+    # Earlier entries of this dataset may have failed to save in the background
+    warning = dataset_write_warning(json_path, entries)
+    if warning:
+        status += f"\n\n{warning}"
+
+    return status, dataset_path, entries
+
+
+def on_export_dataset(json_path: str,
+                      dataset_path: str,
+                      entries: List[Dict[str, Any]]) -> str:
+    """
+    Write the full dataset as an indented JSON list.
+    """
+    json_path = (json_path or "").strip()
+    if not json_path:
+        json_path = "dataset.json"
+
+    # Let the background writer finish first, so it does not overwrite the export
+    flush_dataset_writes()
+
+    try:
+        if dataset_path != json_path:
+            # Questions not yet written to the session's dataset go along to
+            # the new one, through its sidecar so its snapshots keep them
+            with _write_status_lock:
+                unwritten_ids = {entry.get("id") for entry in _unwritten_entries.get(dataset_path, [])}
+            for entry in entries:
+                if entry.get("id") in unwritten_ids:
+                    enqueue_dataset_entry(json_path, entry)
+            entries = open_dataset(json_path)
+        elif sync_sidecar_with_json(json_path):
+            # The JSON file was edited since the session loaded it
+            entries = load_existing_dataset(json_path)
+    except Exception as e:
+        return f"❌ Error opening dataset: {e}"
+    entries = _with_unwritten(json_path, entries)
+
     try:
         save_dataset(json_path, entries)
     except Exception as e:
         return f"❌ Error saving to JSON: {e}"
 
-    return (f"✅ Added question #{len(entries)}.\n\n"
-            f"- ID: `{entry_id}`\n"
-            f"- PDF: `{pdf_name}` page {page_number}\n"
-            f"- Saved to: `{json_path}`")
+    status = f"✅ Exported {len(entries)} question(s) to `{json_path}`."
+    warning = dataset_write_warning(json_path, entries)
+    if warning:
+        status += f"\n\n{warning}"
+    return status
 
 
 # ----------------------------
@@ -337,7 +1104,8 @@ def on_add_question(pdf_dir: str,
 # ----------------------------
 
 def build_interface():
-    with gr.Blocks(title="PDF QA Annotation Tool") as demo:
+    # Gradio keeps a copy of every rendered page in its cache; expire them hourly.
+    with gr.Blocks(title="PDF QA Annotation Tool", delete_cache=(3600, 3600)) as demo:
         gr.Markdown(
             """
             # 📄 PDF QA Annotation Tool
@@ -347,15 +1115,21 @@ def build_interface():
             3. Write questions and ground-truth answers.
             4. Choose question type (free form / MCQ / truth table / fill-in-the-blanks).
             5. Optionally edit the auto-generated structured JSON template.
-            6. Click **Add Question** to append to the dataset JSON.
+            6. Click **Add Question** to append to the dataset.
+            7. Click **Export JSON** to write the dataset JSON file.
 
-            The JSON file will be a list of entries, one per question.
+            Questions are appended to a `.jsonl` file next to the output JSON file
+            as they are added. The JSON file, a list of entries (one per question),
+            is also refreshed in the background every few questions and on exit.
             """
         )
 
         # Shared state
         pdf_dir_state = gr.State("")
-        pdf_map_state = gr.State({})
+        last_rendered_state = gr.State(("", 0))
+        current_pdf_state = gr.State("")
+        dataset_path_state = gr.State("")
+        entries_state = gr.State([])
 
         with gr.Row():
             pdf_dir_input = gr.Textbox(
@@ -383,11 +1157,16 @@ def build_interface():
                 value=1,
                 interactive=True,
             )
+            show_blocks_checkbox = gr.Checkbox(
+                label="Show text blocks",
+                value=False,
+                interactive=True,
+            )
 
         with gr.Row():
             page_image = gr.Image(
                 label="Page Preview",
-                type="pil",
+                type="filepath",
                 interactive=False,
             )
             page_text = gr.Textbox(
@@ -436,6 +1215,7 @@ def build_interface():
                 interactive=True,
             )
             add_button = gr.Button("➕ Add Question to Dataset", variant="primary")
+            export_button = gr.Button("💾 Export JSON")
 
         status_box = gr.Markdown("No questions added yet.")
 
@@ -447,21 +1227,36 @@ def build_interface():
         scan_button.click(
             fn=on_scan_pdfs,
             inputs=[pdf_dir_input],
-            outputs=[pdf_dropdown, pdf_info, pdf_dir_state, pdf_map_state],
+            outputs=[pdf_dropdown, pdf_info, pdf_dir_state],
         )
 
         # When PDF is selected, load first page
         pdf_dropdown.change(
             fn=on_select_pdf,
-            inputs=[pdf_dir_state, pdf_map_state, pdf_dropdown],
-            outputs=[page_image, page_text, page_slider, page_info],
+            inputs=[pdf_dir_state, pdf_dropdown, show_blocks_checkbox, current_pdf_state],
+            outputs=[page_image, page_text, page_slider, page_info, last_rendered_state, current_pdf_state],
         )
 
         # When page slider changes, update page preview
         page_slider.change(
             fn=on_change_page,
-            inputs=[pdf_dir_state, pdf_map_state, pdf_dropdown, page_slider],
-            outputs=[page_image, page_text, page_info],
+            inputs=[
+                pdf_dir_state,
+                pdf_dropdown,
+                page_slider,
+                last_rendered_state,
+                show_blocks_checkbox,
+            ],
+            outputs=[page_image, page_text, page_info, last_rendered_state],
+            # Only the latest slider position is rendered once a render finishes
+            trigger_mode="always_last",
+        )
+
+        # When the text view is toggled, update the extracted text
+        show_blocks_checkbox.change(
+            fn=on_toggle_blocks,
+            inputs=[pdf_dir_state, pdf_dropdown, page_slider, show_blocks_checkbox],
+            outputs=[page_text],
         )
 
         # When question type changes, update template
@@ -476,7 +1271,6 @@ def build_interface():
             fn=on_add_question,
             inputs=[
                 pdf_dir_state,
-                pdf_map_state,
                 pdf_dropdown,
                 page_slider,
                 question_box,
@@ -484,7 +1278,16 @@ def build_interface():
                 qtype_dropdown,
                 structured_meta_box,
                 json_path_box,
+                dataset_path_state,
+                entries_state,
             ],
+            outputs=[status_box, dataset_path_state, entries_state],
+        )
+
+        # Export dataset
+        export_button.click(
+            fn=on_export_dataset,
+            inputs=[json_path_box, dataset_path_state, entries_state],
             outputs=[status_box],
         )
 